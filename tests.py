@@ -1,35 +1,80 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings, tag
 from django.contrib.auth.models import User
 from django.urls import reverse
 from core.models import Package, Booking, Diary, Contact
 
 
+def package_form_data(**overrides):
+    data = {
+        'name': 'New Package',
+        'destination': 'New Destination',
+        'description': 'A new package',
+        'price': '200.00',
+        'days': '7',
+    }
+    data.update(overrides)
+    return data
+
+
+def contact_form_data(**overrides):
+    data = {
+        'name': 'John Doe',
+        'email': 'john@example.com',
+        'contact_number': '1234567890',
+        'comments': 'Test comment'
+    }
+    data.update(overrides)
+    return data
+
+
+# Keep this on TestCase: each test is rolled back to a savepoint. A
+# TransactionTestCase would flush every table between tests instead.
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
 class VoyagoTestCase(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='testpass123')
-        self.admin_user = User.objects.create_superuser(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass123')
+        cls.admin_user = User.objects.create_superuser(
             username='adminuser',
             password='adminpass123',
             email='admin@example.com',
             is_staff=True,
             is_superuser=True
         )
-        self.package = Package.objects.create(
+        cls.package = Package.objects.create(
             name='Test Package',
             destination='Test Destination',
             description='A test package',
             price=100.00,
             days=5,
         )
+        cls.sample_booking = Booking.objects.create(user=cls.user, package=cls.package)
+        cls.index_url = reverse('index')
+        cls.login_url = reverse('login')
+        cls.logout_url = reverse('logout')
+        cls.register_url = reverse('register')
+        cls.bookings_url = reverse('bookings')
+        cls.my_diary_url = reverse('my_diary')
+        cls.contact_url = reverse('contact_us')
+        cls.admin_panel_url = reverse('admin_panel')
+        cls.add_package_url = reverse('add_package')
+        cls.payment_url = reverse('payment', args=[cls.package.id])
+        cls.edit_url = reverse('edit_package', args=[cls.package.id])
+        cls.delete_url = reverse('delete_package', args=[cls.package.id])
+
+    def setUp(self):
+        self.client = Client()
 
     # Model Tests
     def test_package_model_str(self):
         self.assertEqual(str(self.package), 'Test Package')
 
     def test_booking_model_str(self):
-        booking = Booking.objects.create(user=self.user, package=self.package)
-        self.assertEqual(str(booking), 'testuser - Test Package')
+        self.assertEqual(str(self.sample_booking), 'testuser - Test Package')
     
     def test_diary_model_str(self):
         diary = Diary.objects.create(user=self.user, text='Test diary entry')
@@ -47,152 +92,132 @@ class VoyagoTestCase(TestCase):
 
     # View Tests
     def test_index_view(self):
-        response = self.client.get(reverse('index'))
+        response = self.client.get(self.index_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/index.html')
 
     def test_bookings_view(self):
-        response = self.client.get(reverse('bookings'))
+        response = self.client.get(self.bookings_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/bookings.html')
         self.assertContains(response, self.package.name)
 
     def test_payment_view_authenticated(self):
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.get(reverse('payment', args=[self.package.id]))
+        self.client.force_login(self.user)
+        response = self.client.get(self.payment_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/payment.html')
 
     def test_payment_view_unauthenticated(self):
-        response = self.client.get(reverse('payment', args=[self.package.id]))
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(response.url.startswith(reverse('login')))
+        response = self.client.get(self.payment_url)
+        self.assertRedirects(
+            response, f"{self.login_url}?next={self.payment_url}", fetch_redirect_response=False
+        )
 
     def test_payment_post(self):
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.post(reverse('payment', args=[self.package.id]))
+        self.client.force_login(self.user)
+        response = self.client.post(self.payment_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/thank_you.html')
-        self.assertTrue(Booking.objects.filter(user=self.user, package=self.package).exists())
+        self.assertEqual(
+            Booking.objects.filter(user=self.user, package=self.package)
+            .exclude(pk=self.sample_booking.pk)
+            .count(),
+            1,
+        )
 
     def test_my_diary_view(self):
-        response = self.client.get(reverse('my_diary'))
+        response = self.client.get(self.my_diary_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/my_diary.html')
 
     def test_my_diary_post_authenticated(self):
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.post(reverse('my_diary'), {'text': 'New diary entry'})
+        self.client.force_login(self.user)
+        response = self.client.post(self.my_diary_url, {'text': 'New diary entry'})
         self.assertEqual(response.status_code, 302)
         self.assertTrue(Diary.objects.filter(user=self.user, text='New diary entry').exists())
 
     def test_my_diary_post_unauthenticated(self):
-        response = self.client.post(reverse('my_diary'), {'text': 'New diary entry'})
+        response = self.client.post(self.my_diary_url, {'text': 'New diary entry'})
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(response.url.startswith(reverse('login')))
+        self.assertTrue(response.url.startswith(self.login_url))
 
     def test_admin_panel_view(self):
-        self.client.login(username='adminuser', password='adminpass123')
-        response = self.client.get(reverse('admin_panel'))
+        self.client.force_login(self.admin_user)
+        response = self.client.get(self.admin_panel_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/admin_panel.html')
 
     def test_admin_panel_view_non_admin(self):
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.get(reverse('admin_panel'))
+        self.client.force_login(self.user)
+        response = self.client.get(self.admin_panel_url)
         self.assertEqual(response.status_code, 302)
-        print(f"Redirect URL: {response.url}")
         self.assertTrue(response.url.startswith('/admin/login/'))
 
 
     def test_add_package(self):
-        self.client.login(username='adminuser', password='adminpass123')
-        form_data = {
-            'name': 'New Package',
-            'destination': 'New Destination',
-            'description': 'A new package',
-            'price': '200.00',
-            'days': '7',
-        }
-        response = self.client.post(reverse('add_package'), form_data)
-        if response.status_code != 302:
-            print(f"Response status code: {response.status_code}")
-            print(f"Response content: {response.content.decode()}")
-            if response.context is not None and 'form' in response.context:
-                print(f"Add Package Form Errors: {response.context['form'].errors}")
-            else:
-                print("No form in response context. Possible redirect or authentication issue.")
+        self.client.force_login(self.admin_user)
+        response = self.client.post(self.add_package_url, package_form_data())
         self.assertEqual(response.status_code, 302)
         self.assertTrue(Package.objects.filter(name='New Package').exists())
 
     def test_edit_package(self):
-        self.client.login(username='adminuser', password='adminpass123')
-        form_data = {
-            'name': 'Updated Package',
-            'destination': self.package.destination,
-            'description': self.package.description,
-            'price': '100.00',
-            'days': '5',
-        }
-        response = self.client.post(reverse('edit_package', args=[self.package.id]), form_data)
-        if response.status_code != 302:
-            print(f"Response status code: {response.status_code}")
-            print(f"Response content: {response.content.decode()}")
-            if response.context is not None and 'form' in response.context:
-                print(f"Edit Package Form Errors: {response.context['form'].errors}")
-            else:
-                print("No form in response context. Possible redirect or authentication issue.")
+        self.package.refresh_from_db()
+        self.client.force_login(self.admin_user)
+        form_data = package_form_data(
+            name='Updated Package',
+            destination=self.package.destination,
+            description=self.package.description,
+            price='100.00',
+            days='5',
+        )
+        response = self.client.post(self.edit_url, form_data)
         self.assertEqual(response.status_code, 302)
         self.package.refresh_from_db()
         self.assertEqual(self.package.name, 'Updated Package')
 
     def test_delete_package(self):
-        self.client.login(username='adminuser', password='adminpass123')
-        response = self.client.get(reverse('delete_package', args=[self.package.id]))
+        self.package.refresh_from_db()
+        # Start from the baseline state: no booking references the package.
+        self.sample_booking.delete()
+        self.client.force_login(self.admin_user)
+        response = self.client.get(self.delete_url)
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Package.objects.filter(id=self.package.id).exists())
 
 
- def test_contact_us_view(self):
-        response = self.client.get(reverse('contact_us'))
+    def test_contact_us_view(self):
+        response = self.client.get(self.contact_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/contact_us.html')
 
     def test_contact_us_post(self):
-        form_data = {
-            'name': 'John Doe',
-            'email': 'john@example.com',
-            'contact_number': '1234567890',
-            'comments': 'Test comment'
-        }
-        response = self.client.post(reverse('contact_us'), form_data)
+        response = self.client.post(self.contact_url, contact_form_data())
         self.assertEqual(response.status_code, 302)
         self.assertTrue(Contact.objects.filter(email='john@example.com').exists())
 
 
     def test_login_view(self):
-        response = self.client.post(reverse('login'), {
+        response = self.client.post(self.login_url, {
             'username': 'testuser',
             'password': 'testpass123'
         })
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(response.url.endswith(reverse('bookings')))
+        self.assertRedirects(response, self.bookings_url, fetch_redirect_response=False)
 
- def test_register_view(self):
+    def test_register_view(self):
         form_data = {
             'username': 'newuser',
             'password1': 'newpass123',
             'password2': 'newpass123'
         }
-        response = self.client.post(reverse('register'), form_data)
+        response = self.client.post(self.register_url, form_data)
         self.assertEqual(response.status_code, 302)
         self.assertTrue(User.objects.filter(username='newuser').exists())
 
- def test_logout_view(self):
-        self.client.login(username='testuser', password='testpass123')
-        response = self.client.get(reverse('logout'))
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(response.url.endswith(reverse('index')))
+    def test_logout_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.logout_url)
+        self.assertRedirects(response, self.index_url, fetch_redirect_response=False)
 
 
 
@@ -200,32 +225,32 @@ class VoyagoTestCase(TestCase):
 
 
     # Integration Test: User Journey
+    @tag('slow')
     def test_user_journey(self):
         # Register
-        self.client.post(reverse('register'), {
+        self.client.post(self.register_url, {
             'username': 'journeyuser',
             'password1': 'journeypass123',
             'password2': 'journeypass123'
         })
         # Login
-        self.client.post(reverse('login'), {
+        self.client.post(self.login_url, {
             'username': 'journeyuser',
             'password': 'journeypass123'
         })
         # Book a package
-        response = self.client.post(reverse('payment', args=[self.package.id]))
+        response = self.client.post(self.payment_url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'core/thank_you.html')
         # Post to diary
-        response = self.client.post(reverse('my_diary'), {'text': 'My travel story'})
+        response = self.client.post(self.my_diary_url, {'text': 'My travel story'})
         self.assertEqual(response.status_code, 302)
         self.assertTrue(Diary.objects.filter(text='My travel story').exists())
         # Contact form
-        response = self.client.post(reverse('contact_us'), {
-            'name': 'Journey User',
-            'email': 'journey@example.com',
-            'contact_number': '1234567890',
-            'comments': 'Great service'
-        })
+        response = self.client.post(self.contact_url, contact_form_data(
+            name='Journey User',
+            email='journey@example.com',
+            comments='Great service'
+        ))
         self.assertEqual(response.status_code, 302)
         self.assertTrue(Contact.objects.filter(email='journey@example.com').exists())